@@ -2,7 +2,7 @@ import streamlit as st
 import pandas as pd
 import json
 import datetime
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 # Page configuration
 st.set_page_config(
@@ -12,7 +12,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -34,55 +34,53 @@ st.markdown("""
         margin: 0.5rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+PLATFORMS = ("Instagram", "TikTok", "Email", "Twitter", "LinkedIn", "Facebook")
+CAMPAIGN_PHASES = ("Awareness", "Consideration", "Conversion", "Retention")
+
+# Widget keys, precomputed once instead of formatted on every rerun
+MAX_PROMPTS = len(PLATFORMS) + 2  # Foundation + one per platform + Asset Development
+PLATFORM_GOAL_KEYS = {p: f"goal_{p}" for p in PLATFORMS}
+PHASE_GOAL_KEYS = {ph: f"goal_{ph}" for ph in CAMPAIGN_PHASES}
+PHASE_MESSAGES_KEYS = {ph: f"messages_{ph}" for ph in CAMPAIGN_PHASES}
+PHASE_CTA_KEYS = {ph: f"cta_{ph}" for ph in CAMPAIGN_PHASES}
+PHASE_TYPES_KEYS = {ph: f"types_{ph}" for ph in CAMPAIGN_PHASES}
+PROMPT_KEYS = [f"prompt_{i}" for i in range(MAX_PROMPTS)]
+COPY_KEYS = [f"copy_{i}" for i in range(MAX_PROMPTS)]
+
+# Campaign fields stored directly in session_state by their widgets' key=
+FIELD_KEYS = ("product_name", "target_audience", "campaign_duration", "key_message",
+              "campaign_goal", "budget_tier", "selected_platforms", "campaign_phases")
+
+# Per-platform and per-phase planning inputs, kept alongside the campaign fields
+STEP_INPUT_KEYS = tuple(
+    key
+    for table in (PLATFORM_GOAL_KEYS, PHASE_GOAL_KEYS, PHASE_MESSAGES_KEYS, PHASE_CTA_KEYS, PHASE_TYPES_KEYS)
+    for key in table.values()
+)
 
 class CampaignBuilder:
-    def __init__(self):
-        self.platforms = ["Instagram", "TikTok", "Email", "Twitter", "LinkedIn", "Facebook"]
-        self.campaign_phases = ["Awareness", "Consideration", "Conversion", "Retention"]
-        
-    def generate_prompt_sequence(self, campaign_data: Dict) -> List[Dict]:
-        """Generate sequential prompts based on campaign parameters"""
-        prompts = []
-        
-        # Safely get values with defaults to prevent KeyError
-        product_name = campaign_data.get('product_name', 'Your Product')
-        target_audience = campaign_data.get('target_audience', 'your target audience')
-        key_message = campaign_data.get('key_message', 'your key message')
-        selected_platforms = campaign_data.get('selected_platforms', ['Instagram', 'TikTok'])
-        campaign_phases = campaign_data.get('campaign_phases', ['Awareness'])
-
-        # Phase 1: Foundation
-        prompts.append({
-            "phase": "Foundation",
-            "platform": "All",
-            "prompt": f"""Act as a senior marketing strategist. Create a multi-platform campaign for:
+    platforms = PLATFORMS
+    campaign_phases = CAMPAIGN_PHASES
+
+# Prompt templates, filled per campaign with str.format_map
+FOUNDATION_TMPL = """Act as a senior marketing strategist. Create a multi-platform campaign for:
             
 Product: {product_name}
 Target Audience: {target_audience}
 Key Message: {key_message}
-Platforms: {', '.join(selected_platforms)}
+Platforms: {platforms}
 
 Propose a weekly strategy with specific goals for each platform."""
-        })
-        
-        # Phase 2: Platform-specific content
-        for platform in selected_platforms:
-            prompts.append({
-                "phase": "Content Creation",
-                "platform": platform,
-                "prompt": f"""For {platform}, generate 3-5 content ideas for the {campaign_phases[0] if campaign_phases else 'Awareness'} phase targeting {target_audience}. Focus on:
+
+PLATFORM_TMPL = """For {platform}, generate 3-5 content ideas for the {first_phase} phase targeting {target_audience}. Focus on:
 - Platform-best practices for {platform}
 - Content format recommendations
 - Hashtag strategy
 - Engagement tactics"""
-            })
-        
-        # Phase 3: Asset creation
-        prompts.append({
-            "phase": "Asset Development",
-            "platform": "All",
-            "prompt": f"""Create specific copy and content guidelines for:
+
+ASSET_TMPL = """Create specific copy and content guidelines for:
 Product: {product_name}
 
 Include:
@@ -90,296 +88,398 @@ Include:
 - 3 Instagram carousel concepts
 - 2 TikTok script outlines
 - Social media post templates"""
-        })
-        
-        return prompts
 
-def main():
-    st.markdown('<div class="main-header">🚀 Multi-Platform Campaign Builder</div>', unsafe_allow_html=True)
+@st.cache_data
+def generate_prompt_sequence(product_name: str, target_audience: str, key_message: str,
+                             selected_platforms: Tuple[str, ...], first_phase: str) -> List[Dict]:
+    """Generate sequential prompts based on campaign parameters"""
+    fields = {
+        "product_name": product_name,
+        "target_audience": target_audience,
+        "key_message": key_message,
+        "platforms": ', '.join(selected_platforms),
+        "first_phase": first_phase
+    }
     
-    # Initialize session state
-    if 'campaign_data' not in st.session_state:
-        st.session_state.campaign_data = {}
-    if 'prompts' not in st.session_state:
-        st.session_state.prompts = []
-    if 'current_step' not in st.session_state:
-        st.session_state.current_step = 0
+    # Phase 1: Foundation
+    prompts = [{
+        "phase": "Foundation",
+        "platform": "All",
+        "prompt": FOUNDATION_TMPL.format_map(fields)
+    }]
     
-    builder = CampaignBuilder()
+    # Phase 2: Platform-specific content
+    for platform in selected_platforms:
+        prompts.append({
+            "phase": "Content Creation",
+            "platform": platform,
+            "prompt": PLATFORM_TMPL.format(platform=platform, first_phase=first_phase, target_audience=target_audience)
+        })
     
-    # Sidebar for navigation
-    with st.sidebar:
-        st.header("Campaign Builder Steps")
-        steps = ["Campaign Foundation", "Platform Selection", "Content Strategy", "Prompt Generation", "Execution Plan"]
-        
-        for i, step in enumerate(steps):
-            if st.button(step, key=f"step_{i}", use_container_width=True):
-                st.session_state.current_step = i
-        
-        st.markdown("---")
-        st.header("Quick Actions")
-        if st.button("Reset Campaign", type="secondary"):
-            st.session_state.campaign_data = {}
-            st.session_state.prompts = []
-            st.session_state.current_step = 0
-            st.rerun()
+    # Phase 3: Asset creation
+    prompts.append({
+        "phase": "Asset Development",
+        "platform": "All",
+        "prompt": ASSET_TMPL.format_map(fields)
+    })
     
-    # Step 1: Campaign Foundation
-    if st.session_state.current_step == 0:
-        st.header("🎯 Campaign Foundation")
-        
-        col1, col2 = st.columns(2)
+    return prompts
+
+def _campaign_data() -> Dict:
+    """Snapshot of the widget-bound campaign fields entered so far"""
+    return {key: st.session_state[key] for key in FIELD_KEYS if key in st.session_state}
+
+def _reset_campaign():
+    """Clear campaign fields, planning inputs and prompts and return to the first step"""
+    for key in FIELD_KEYS + STEP_INPUT_KEYS:
+        if key in st.session_state:
+            del st.session_state[key]
+    st.session_state.prompts = []
+    st.session_state.prompts_key = None
+    st.session_state.show_timeline = False
+    st.session_state.current_step = 0
+
+def _toggle_timeline():
+    """Button callback: show or hide the execution timeline"""
+    st.session_state.show_timeline = not st.session_state.get('show_timeline', False)
+
+@st.cache_data
+def build_timeline(phases: Tuple[str, ...], platforms: Tuple[str, ...]) -> pd.DataFrame:
+    """Weekly phase x platform task timeline"""
+    n_ph, n_pl = len(phases), len(platforms)
+    
+    # Build column-wise: one list per column instead of one dict per row
+    return pd.DataFrame({
+        "Week": [f"Week {i+1}" for i in range(n_ph) for _ in range(n_pl)],
+        "Phase": [phase for phase in phases for _ in range(n_pl)],
+        "Platform": list(platforms) * n_ph,
+        "Task": [f"Create {platform} content for {phase}" for phase in phases for platform in platforms],
+        "Status": ["Planned"] * (n_ph * n_pl)
+    })
+
+@st.cache_resource
+def get_builder() -> CampaignBuilder:
+    """Shared builder instance, reused across reruns and sessions"""
+    return CampaignBuilder()
+
+@st.cache_data
+def _df_to_csv(df: pd.DataFrame) -> bytes:
+    """CSV bytes for a timeline download"""
+    return df.to_csv(index=False).encode()
+
+@st.cache_data
+def _json_view(items: Tuple) -> str:
+    """Campaign summary encoded once for st.json, which passes a str through as-is"""
+    return json.dumps(dict(items))
+
+@st.fragment
+def _render_prompt(i: int, prompt_data: Dict):
+    """Render one generated prompt; its copy button only reruns this fragment"""
+    with st.container():
+        st.markdown(f"""
+        <div class="campaign-phase">
+            <h4>Step {i+1}: {prompt_data['phase']} - {prompt_data['platform']}</h4>
+        </div>
+        """, unsafe_allow_html=True)
         
-        with col1:
-            st.session_state.campaign_data['product_name'] = st.text_input(
-                "Product/Service Name",
-                placeholder="EcoVibe Reusable Bottles"
-            )
-            
-            st.session_state.campaign_data['target_audience'] = st.text_area(
-                "Target Audience",
-                placeholder="Eco-conscious millennials and Gen Z, aged 18-30, interested in sustainability..."
-            )
-            
-            st.session_state.campaign_data['campaign_duration'] = st.selectbox(
-                "Campaign Duration",
-                ["2 weeks", "4 weeks", "6 weeks", "8 weeks"]
-            )
+        st.text_area(
+            f"Prompt {i+1}",
+            value=prompt_data['prompt'],
+            height=150,
+            key=PROMPT_KEYS[i]
+        )
         
+        col1, col2 = st.columns([3, 1])
         with col2:
-            st.session_state.campaign_data['key_message'] = st.text_area(
-                "Key Message",
-                placeholder="Stylish sustainability for the modern eco-warrior..."
-            )
-            
-            st.session_state.campaign_data['campaign_goal'] = st.selectbox(
-                "Primary Campaign Goal",
-                ["Brand Awareness", "Lead Generation", "Product Launch", "Engagement", "Sales Conversion"]
-            )
-            
-            st.session_state.campaign_data['budget_tier'] = st.selectbox(
-                "Budget Tier",
-                ["Bootstrapped", "Moderate", "Amplified", "Enterprise"]
-            )
-        
-        if st.button("Save Foundation & Continue", type="primary"):
-            st.session_state.current_step = 1
-            st.rerun()
+            if st.button("Copy Prompt", key=COPY_KEYS[i]):
+                st.code(prompt_data['prompt'], language=None)
+                st.success("Prompt copied to clipboard!")
+
+@st.fragment
+def show_timeline(timeline_df: pd.DataFrame):
+    """Render the timeline table and its CSV download"""
+    st.dataframe(timeline_df, use_container_width=True)
     
-    # Step 2: Platform Selection
-    elif st.session_state.current_step == 1:
-        st.header("📱 Platform Selection")
-        
-        st.subheader("Choose Your Platforms")
-        selected_platforms = []
-        
-        cols = st.columns(3)
-        for i, platform in enumerate(builder.platforms):
-            with cols[i % 3]:
-                if st.checkbox(platform, key=f"platform_{platform}"):
-                    selected_platforms.append(platform)
-        
-        st.session_state.campaign_data['selected_platforms'] = selected_platforms
+    # Download option
+    st.download_button(
+        label="Download Timeline as CSV",
+        data=_df_to_csv(timeline_df),
+        file_name="campaign_timeline.csv",
+        mime="text/csv"
+    )
+
+# Step 1: Campaign Foundation
+@st.fragment
+def _step0(builder: CampaignBuilder):
+    """Render the Campaign Foundation step"""
+    st.header("🎯 Campaign Foundation")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.text_input(
+            "Product/Service Name",
+            placeholder="EcoVibe Reusable Bottles",
+            key="product_name"
+        )
         
-        if selected_platforms:
-            st.subheader("Platform Strategy Overview")
-            for platform in selected_platforms:
-                with st.expander(f"{platform} Strategy"):
-                    st.text_area(
-                        f"Specific goals for {platform}",
-                        placeholder=f"What do you want to achieve on {platform}?",
-                        key=f"goal_{platform}"
-                    )
+        st.text_area(
+            "Target Audience",
+            placeholder="Eco-conscious millennials and Gen Z, aged 18-30, interested in sustainability...",
+            key="target_audience"
+        )
         
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("← Back", use_container_width=True):
-                st.session_state.current_step = 0
-                st.rerun()
-        with col2:
-            if st.button("Continue to Content Strategy →", type="primary", use_container_width=True):
-                st.session_state.current_step = 2
-                st.rerun()
+        st.selectbox(
+            "Campaign Duration",
+            ["2 weeks", "4 weeks", "6 weeks", "8 weeks"],
+            key="campaign_duration"
+        )
     
-    # Step 3: Content Strategy
-    elif st.session_state.current_step == 2:
-        st.header("📝 Content Strategy")
-        
-        st.subheader("Campaign Phases")
-        selected_phases = st.multiselect(
-            "Select campaign phases:",
-            builder.campaign_phases,
-            default=builder.campaign_phases
+    with col2:
+        st.text_area(
+            "Key Message",
+            placeholder="Stylish sustainability for the modern eco-warrior...",
+            key="key_message"
         )
         
-        st.session_state.campaign_data['campaign_phases'] = selected_phases
+        st.selectbox(
+            "Primary Campaign Goal",
+            ["Brand Awareness", "Lead Generation", "Product Launch", "Engagement", "Sales Conversion"],
+            key="campaign_goal"
+        )
         
-        if selected_phases:
-            for phase in selected_phases:
-                with st.expander(f"Phase: {phase}", expanded=True):
-                    col1, col2 = st.columns(2)
+        st.selectbox(
+            "Budget Tier",
+            ["Bootstrapped", "Moderate", "Amplified", "Enterprise"],
+            key="budget_tier"
+        )
+
+# Step 2: Platform Selection
+@st.fragment
+def _step1(builder: CampaignBuilder):
+    """Render the Platform Selection step"""
+    st.header("📱 Platform Selection")
+    
+    st.subheader("Choose Your Platforms")
+    selected_platforms = st.multiselect(
+        "Choose platforms",
+        builder.platforms,
+        key="selected_platforms"
+    )
+    
+    if selected_platforms:
+        st.subheader("Platform Strategy Overview")
+        for platform in selected_platforms:
+            with st.expander(f"{platform} Strategy"):
+                st.text_area(
+                    f"Specific goals for {platform}",
+                    placeholder=f"What do you want to achieve on {platform}?",
+                    key=PLATFORM_GOAL_KEYS[platform]
+                )
+
+# Step 3: Content Strategy
+@st.fragment
+def _step2(builder: CampaignBuilder):
+    """Render the Content Strategy step"""
+    st.header("📝 Content Strategy")
+    
+    st.subheader("Campaign Phases")
+    # Seed through session_state; a default= would clash with the bound key
+    if 'campaign_phases' not in st.session_state:
+        st.session_state.campaign_phases = list(builder.campaign_phases)
+    selected_phases = st.multiselect(
+        "Select campaign phases:",
+        builder.campaign_phases,
+        key="campaign_phases"
+    )
+    
+    if selected_phases:
+        for phase in selected_phases:
+            with st.expander(f"Phase: {phase}", expanded=True):
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.text_input(
+                        f"{phase} Goal",
+                        placeholder=f"Primary objective for {phase} phase",
+                        key=PHASE_GOAL_KEYS[phase]
+                    )
                     
-                    with col1:
-                        st.text_input(
-                            f"{phase} Goal",
-                            placeholder=f"Primary objective for {phase} phase",
-                            key=f"goal_{phase}"
-                        )
-                        
-                        st.text_area(
-                            f"{phase} Key Messages",
-                            placeholder="Main talking points...",
-                            key=f"messages_{phase}"
-                        )
+                    st.text_area(
+                        f"{phase} Key Messages",
+                        placeholder="Main talking points...",
+                        key=PHASE_MESSAGES_KEYS[phase]
+                    )
+                
+                with col2:
+                    st.text_area(
+                        f"{phase} Call-to-Action",
+                        placeholder="What should users do?",
+                        key=PHASE_CTA_KEYS[phase]
+                    )
                     
-                    with col2:
-                        st.text_area(
-                            f"{phase} Call-to-Action",
-                            placeholder="What should users do?",
-                            key=f"cta_{phase}"
-                        )
-                        
-                        st.multiselect(
-                            f"{phase} Content Types",
-                            ["Video", "Images", "Carousels", "Stories", "Blog Posts", "Emails"],
-                            key=f"types_{phase}"
-                        )
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("← Back", use_container_width=True):
-                st.session_state.current_step = 1
-                st.rerun()
-        with col2:
-            if st.button("Generate Prompts →", type="primary", use_container_width=True):
-                st.session_state.current_step = 3
-                st.rerun()
+                    st.multiselect(
+                        f"{phase} Content Types",
+                        ["Video", "Images", "Carousels", "Stories", "Blog Posts", "Emails"],
+                        key=PHASE_TYPES_KEYS[phase]
+                    )
+
+# Step 4: Prompt Generation
+@st.fragment
+def _step3(builder: CampaignBuilder):
+    """Render the Prompt Generation step"""
+    st.header("🤖 Sequential Prompt Generation")
+    
+    # Safely get values with defaults to prevent KeyError
+    cd = _campaign_data()
+    prompt_args = (
+        cd.get('product_name', 'Your Product'),
+        cd.get('target_audience', 'your target audience'),
+        cd.get('key_message', 'your key message'),
+        tuple(cd.get('selected_platforms', ['Instagram', 'TikTok'])),
+        (cd.get('campaign_phases') or ['Awareness'])[0]
+    )
     
-    # Step 4: Prompt Generation
-    elif st.session_state.current_step == 3:
-        st.header("🤖 Sequential Prompt Generation")
+    # Regenerate only when the arguments the prompts are built from have changed
+    inputs_key = hash(prompt_args)
+    if st.session_state.get('prompts_key') != inputs_key:
+        st.session_state.prompts = generate_prompt_sequence(*prompt_args)
+        st.session_state.prompts_key = inputs_key
+    
+    st.success(f"Generated {len(st.session_state.prompts)} sequential prompts for your campaign!")
+    
+    # Display prompts in sequence
+    for i, prompt_data in enumerate(st.session_state.prompts):
+        _render_prompt(i, prompt_data)
+    
+    # Execution plan generation
+    st.subheader("🎯 Campaign Execution Plan")
+    
+    phases = tuple(cd.get('campaign_phases', []))
+    platforms = tuple(cd.get('selected_platforms', []))
+    if phases and platforms:
+        # Built (and cached) up front; the button only shows or hides it
+        timeline_df = build_timeline(phases, platforms)
+        showing = st.session_state.get('show_timeline', False)
+        st.button(
+            "Hide Campaign Timeline" if showing else "Generate Campaign Timeline",
+            type="primary",
+            on_click=_toggle_timeline
+        )
+        if showing:
+            show_timeline(timeline_df)
+    else:
+        st.info("Select platforms and campaign phases to build a timeline.")
+
+# Step 5: Final Plan
+@st.fragment
+def _step4(builder: CampaignBuilder):
+    """Render the Final Plan step"""
+    # FIELD_KEYS order keeps this snapshot stable as a cache key
+    campaign_items = tuple(_campaign_data().items())
+    st.header("✅ Campaign Execution Plan")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("Campaign Summary")
+        st.json(_json_view(campaign_items))
         
-        if not st.session_state.prompts:
-            st.session_state.prompts = builder.generate_prompt_sequence(st.session_state.campaign_data)
+        st.subheader("Generated Prompts")
+        st.info(f"Total prompts generated: {len(st.session_state.prompts)}")
         
-        st.success(f"Generated {len(st.session_state.prompts)} sequential prompts for your campaign!")
+        for i, prompt in enumerate(st.session_state.prompts):
+            with st.expander(f"Prompt {i+1}: {prompt['phase']}"):
+                st.write(prompt['prompt'])
+    
+    with col2:
+        st.subheader("Quick Start Guide")
         
-        # Display prompts in sequence
-        for i, prompt_data in enumerate(st.session_state.prompts):
-            with st.container():
-                st.markdown(f"""
-                <div class="campaign-phase">
-                    <h4>Step {i+1}: {prompt_data['phase']} - {prompt_data['platform']}</h4>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                st.text_area(
-                    f"Prompt {i+1}",
-                    value=prompt_data['prompt'],
-                    height=150,
-                    key=f"prompt_{i}"
-                )
-                
-                col1, col2 = st.columns([3, 1])
-                with col2:
-                    if st.button("Copy Prompt", key=f"copy_{i}"):
-                        st.code(prompt_data['prompt'], language=None)
-                        st.success("Prompt copied to clipboard!")
+        st.markdown("""
+        1. **Start with Foundation Prompt** - Get overall strategy
+        2. **Move to Platform-specific Prompts** - Generate tailored content
+        3. **Use Asset Development Prompts** - Create actual copy and visuals
+        4. **Execute in Sequence** - Follow the generated timeline
+        """)
         
-        # Execution plan generation
-        st.subheader("🎯 Campaign Execution Plan")
+        st.subheader("Next Steps")
+        st.markdown("""
+        - Copy prompts to your preferred AI tool
+        - Refine outputs based on your brand voice
+        - Set up your content calendar
+        - Begin execution according to timeline
+        """)
         
-        if st.button("Generate Campaign Timeline", type="primary"):
-            timeline_data = []
-            start_date = datetime.date.today()
+        # Export campaign data
+        if st.button("Export Campaign Plan", type="primary"):
+            campaign_export = {
+                "campaign_data": _campaign_data(),
+                "prompts": st.session_state.prompts,
+                "generated_at": str(datetime.datetime.now())
+            }
             
-            for i, phase in enumerate(st.session_state.campaign_data.get('campaign_phases', [])):
-                for j, platform in enumerate(st.session_state.campaign_data.get('selected_platforms', [])):
-                    timeline_data.append({
-                        "Week": f"Week {i+1}",
-                        "Phase": phase,
-                        "Platform": platform,
-                        "Task": f"Create {platform} content for {phase}",
-                        "Status": "Planned"
-                    })
-            
-            timeline_df = pd.DataFrame(timeline_data)
-            st.dataframe(timeline_df, use_container_width=True)
-            
-            # Download option
-            csv = timeline_df.to_csv(index=False)
             st.download_button(
-                label="Download Timeline as CSV",
-                data=csv,
-                file_name="campaign_timeline.csv",
-                mime="text/csv"
+                label="Download JSON Export",
+                data=json.dumps(campaign_export, indent=2),
+                file_name="campaign_plan.json",
+                mime="application/json"
             )
-        
+
+STEPS = (_step0, _step1, _step2, _step3, _step4)
+STEP_KEYS = tuple(f"step_{i}" for i in range(len(STEPS)))
+
+# Label of the button that advances past each step
+NEXT_LABELS = ("Save Foundation & Continue", "Continue to Content Strategy →", "Generate Prompts →", "View Final Plan →")
+
+def _go_to(step: int):
+    """Button callback: switch steps before the triggered rerun starts"""
+    st.session_state.current_step = step
+
+def _render_nav(step: int):
+    """Navigation under the current step, kept outside the step fragments so a click reruns the whole app"""
+    if step == 0:
+        st.button(NEXT_LABELS[0], type="primary", on_click=_go_to, args=(1,))
+    elif step < len(NEXT_LABELS):
         col1, col2 = st.columns(2)
         with col1:
-            if st.button("← Back", use_container_width=True):
-                st.session_state.current_step = 2
-                st.rerun()
+            st.button("← Back", use_container_width=True, on_click=_go_to, args=(step - 1,))
         with col2:
-            if st.button("View Final Plan →", type="primary", use_container_width=True):
-                st.session_state.current_step = 4
-                st.rerun()
+            st.button(NEXT_LABELS[step], type="primary", use_container_width=True, on_click=_go_to, args=(step + 1,))
+    else:
+        st.button("Start New Campaign", type="secondary", on_click=_reset_campaign)
+
+def main():
+    st.markdown(CSS, unsafe_allow_html=True)
+    st.markdown('<div class="main-header">🚀 Multi-Platform Campaign Builder</div>', unsafe_allow_html=True)
     
-    # Step 5: Final Plan
-    elif st.session_state.current_step == 4:
-        st.header("✅ Campaign Execution Plan")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Campaign Summary")
-            st.json(st.session_state.campaign_data)
-            
-            st.subheader("Generated Prompts")
-            st.info(f"Total prompts generated: {len(st.session_state.prompts)}")
-            
-            for i, prompt in enumerate(st.session_state.prompts):
-                with st.expander(f"Prompt {i+1}: {prompt['phase']}"):
-                    st.write(prompt['prompt'])
+    # Initialize session state
+    if 'prompts' not in st.session_state:
+        st.session_state.prompts = []
+    if 'current_step' not in st.session_state:
+        st.session_state.current_step = 0
+    
+    # Re-assign every keyed input so Streamlit keeps it while its widget is off-screen
+    for key in FIELD_KEYS + STEP_INPUT_KEYS:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+    
+    builder = get_builder()
+    
+    # Sidebar for navigation
+    with st.sidebar:
+        st.header("Campaign Builder Steps")
+        steps = ["Campaign Foundation", "Platform Selection", "Content Strategy", "Prompt Generation", "Execution Plan"]
         
-        with col2:
-            st.subheader("Quick Start Guide")
-            
-            st.markdown("""
-            1. **Start with Foundation Prompt** - Get overall strategy
-            2. **Move to Platform-specific Prompts** - Generate tailored content
-            3. **Use Asset Development Prompts** - Create actual copy and visuals
-            4. **Execute in Sequence** - Follow the generated timeline
-            """)
-            
-            st.subheader("Next Steps")
-            st.markdown("""
-            - Copy prompts to your preferred AI tool
-            - Refine outputs based on your brand voice
-            - Set up your content calendar
-            - Begin execution according to timeline
-            """)
-            
-            # Export campaign data
-            if st.button("Export Campaign Plan", type="primary"):
-                campaign_export = {
-                    "campaign_data": st.session_state.campaign_data,
-                    "prompts": st.session_state.prompts,
-                    "generated_at": str(datetime.datetime.now())
-                }
-                
-                st.download_button(
-                    label="Download JSON Export",
-                    data=json.dumps(campaign_export, indent=2),
-                    file_name="campaign_plan.json",
-                    mime="application/json"
-                )
+        for i, step in enumerate(steps):
+            st.button(step, key=STEP_KEYS[i], use_container_width=True, on_click=_go_to, args=(i,))
         
-        if st.button("Start New Campaign", type="secondary"):
-            st.session_state.campaign_data = {}
-            st.session_state.prompts = []
-            st.session_state.current_step = 0
-            st.rerun()
+        st.markdown("---")
+        st.header("Quick Actions")
+        st.button("Reset Campaign", type="secondary", on_click=_reset_campaign)
+    
+    # Render the current step
+    STEPS[st.session_state.current_step](builder)
+    _render_nav(st.session_state.current_step)
 
 if __name__ == "__main__":
     main()